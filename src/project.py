@@ -5,11 +5,14 @@ status, execute operations and submit them to a cluster. See also:
 
     $ python src/project.py --help
 """
+import functools
+import re
+
 import flow
 from flow import FlowProject, directives
 from flow.environment import DefaultSlurmEnvironment
 from flow.environments.xsede import Bridges2Environment
-from os import path
+from os import SEEK_END, path
 
 
 class MyProject(FlowProject):
@@ -96,21 +99,31 @@ def get_paths(key, job):
     try:
         return COMPOUND[key]
     except KeyError:
+        if path.isfile(key):
+            print(f"Using {key} for structure")
+            return key
         # job.ws will be the path to the job e.g.,
         # path/to/planckton-flow/workspace/jobid
         # this is the planckton root dir e.g.,
         # path/to/planckton-flow
-        file_path = path.abspath(path.join(job.ws, "..", "..", key))
-        if path.isfile(key):
-            print(f"Using {key} for structure")
-            return key
-        elif path.isfile(file_path):
+        project_root = path.abspath(path.join(job.ws, "..", ".."))
+        file_path = _resolve(key, project_root)
+        if file_path is not None:
             print(f"Using {file_path} for structure")
             return file_path
         else:
             print(f"Using {key} for structure--assuming SMILES input")
             return key
 
+
+@functools.lru_cache(maxsize=None)
+def _resolve(key, project_root):
+    # The project root is shared by every job, so this lookup only needs to
+    # hit the filesystem once per input
+    file_path = path.abspath(path.join(project_root, key))
+    if path.isfile(file_path):
+        return file_path
+
 def on_container(func):
     return flow.directives(
         executable='singularity exec --nv $PLANCKTON_SIMG python'
@@ -203,27 +216,51 @@ def sample(job):
             job.doc["total_time"] = time
 
 
-def get_tps_time(outfiles):
-    import numpy as np
+TPS_RE = re.compile(rb"Average TPS:\s*([\d.eE+-]+)")
+TIME_RE = re.compile(rb"Time\s+(\d+):(\d+):(\d+)")
+
 
+def reverse_readline(filename, chunk=65536):
+    """Yield the lines of a file in reverse order, reading from the end."""
+    with open(filename, "rb") as f:
+        pos = f.seek(0, SEEK_END)
+        remainder = b""
+        while pos > 0:
+            size = min(chunk, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # the first piece may be a partial line, so carry it over
+            remainder = lines.pop(0)
+            yield from reversed(lines)
+        yield remainder
+
+
+def get_tps_time(outfiles):
     times = []
     for ofile in outfiles:
-        with open(ofile) as f:
-            lines = f.readlines()
-            try:
-                # first value is TPS for shrink, second value is for sim
-                tpsline = [l for l in lines if "Average TPS" in l][-1]
-                tps = tpsline.strip("Average TPS:").strip()
-
-                t_lines = [l for l in lines if "Time" in l]
-                h,m,s = t_lines[-1].split(" ")[1].split(":")
-                times.append(int(h)*3600 + int(m)*60 + int(s))
-            except IndexError:
-                # This will catch outputs from failures or non-hoomd operations
-                # (e.g. analysis) in the job dir
-                pass
+        # the last match of each is near the end, so read the file backwards;
+        # for TPS the first value is for shrink, the last value is for sim
+        tps_match = None
+        time_match = None
+        for line in reverse_readline(ofile):
+            if tps_match is None:
+                tps_match = TPS_RE.search(line)
+            if time_match is None:
+                time_match = TIME_RE.search(line)
+            if tps_match and time_match:
+                break
+        # This will skip outputs from failures or non-hoomd operations
+        # (e.g. analysis) in the job dir
+        if tps_match is None:
+            continue
+        tps = tps_match.group(1).decode()
+        if time_match is None:
+            continue
+        h,m,s = time_match.groups()
+        times.append(int(h)*3600 + int(m)*60 + int(s))
     # total time in seconds
-    total_time = np.sum(times)
+    total_time = sum(times)
     hh = total_time // 3600
     mm = (total_time - hh*3600) // 60
     ss = total_time % 60